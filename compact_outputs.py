@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+from logging_config import setup_logging, get_logger
+
+from utils.compaction import compact_outputs
+from config import CONFIG
+
+# Setup logging
+setup_logging()
+logger = get_logger(__name__)
+
+def positive_int(value: str) -> int:
+    """Argparse type that accepts integers of at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def main() -> None:
+    """
+    Compacts memory_*.json files from the output directory into columnar part files.
+
+    Example usage:
+        python compact_outputs.py
+        python compact_outputs.py --remove-originals --workers 8
+        python compact_outputs.py /path/to/outputs --format jsonl
+
+    Part files and a manifest are written to <output_dir>/compacted. Files already
+    listed in the manifest are skipped, so the command can be rerun incrementally.
+    """
+    parser = argparse.ArgumentParser(description="Compact memory JSON files into columnar part files.")
+    parser.add_argument("output_dir", nargs="?", default=CONFIG.output_dir,
+                        help="Directory containing memory_*.json files")
+    parser.add_argument("--remove-originals", action="store_true",
+                        help="Delete source files after they are compacted")
+    parser.add_argument("--workers", type=positive_int, default=CONFIG.compaction_workers,
+                        help="Number of reader processes")
+    parser.add_argument("--batch-size", type=positive_int, default=CONFIG.compaction_batch_size,
+                        help="Number of files read per worker task")
+    parser.add_argument("--part-size", type=positive_int, default=CONFIG.compaction_part_size,
+                        help="Maximum number of files folded into each part file")
+    parser.add_argument("--format", dest="output_format", choices=["auto", "parquet", "jsonl"],
+                        default="auto", help="Part file format (auto prefers parquet when pyarrow is installed)")
+    args = parser.parse_args()
+
+    try:
+        summary = compact_outputs(
+            output_dir=args.output_dir,
+            remove_originals=args.remove_originals,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            part_size=args.part_size,
+            output_format=args.output_format
+        )
+    except (OSError, ValueError) as e:
+        logger.error(f"Compaction failed: {e}")
+        sys.exit(1)
+
+    logger.info(
+        f"Compaction finished: {summary['compacted']} compacted into {len(summary['parts'])} parts, "
+        f"{summary['failed']} failed, {summary['removed']} removed."
+    )
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,21 @@ class Config:
     large_file_threshold: int
     buffer_size: int
     max_file_size: int
+    # Per-stage model routing for the segmentation and extraction agents
+    seg_model_name: str
+    seg_temperature: float
+    seg_num_ctx: int
+    mem_model_name: str
+    mem_temperature: float
+    mem_num_ctx: int
+    # Rule-based fast path for short, self-contained core memories
+    fast_path_enabled: bool
+    fast_path_max_chars: int
+    fast_path_min_tags: int
+    # Bulk compaction of memory files in the output directory
+    compaction_workers: int
+    compaction_batch_size: int
+    compaction_part_size: int
 
 # Load API key from api.txt file with proper error handling
 try:
@@ -40,20 +55,37 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+# Global model settings; the per-stage settings below fall back to these
+MODEL_NAME = "deepseek-chat"
+TEMPERATURE = 0.8
+GENERATION_WINDOW = 8064
+
 # Create configuration instance
 CONFIG = Config(
     base_url=os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com"),
     api_version="/v1/",
-    model_name="deepseek-chat",
-    temperature=0.8,
+    model_name=MODEL_NAME,
+    temperature=TEMPERATURE,
     chunk_size=20000,
     chunk_overlap=200,
-    generation_window=8064,
+    generation_window=GENERATION_WINDOW,
     request_timeout=90,
     output_dir=os.path.join(os.getcwd(), "outputs"),
     large_file_threshold=100 * 1024 * 1024,
     buffer_size=1024 * 1024,
-    max_file_size=1024 * 1024 * 1024
+    max_file_size=1024 * 1024 * 1024,
+    seg_model_name=os.getenv("SEG_MODEL_NAME", MODEL_NAME),
+    seg_temperature=TEMPERATURE,
+    seg_num_ctx=GENERATION_WINDOW,
+    mem_model_name=os.getenv("MEM_MODEL_NAME", MODEL_NAME),
+    mem_temperature=TEMPERATURE,
+    mem_num_ctx=GENERATION_WINDOW,
+    fast_path_enabled=False,
+    fast_path_max_chars=160,
+    fast_path_min_tags=3,
+    compaction_workers=os.cpu_count() or 1,
+    compaction_batch_size=1000,
+    compaction_part_size=100000
 )
 
 # Construct full API URL using urljoin for proper URL handling
@@ -65,7 +97,9 @@ def validate_config(config: Config) -> bool:
         'base_url', 'api_version', 'model_name', 'temperature',
         'chunk_size', 'chunk_overlap', 'generation_window',
         'request_timeout', 'output_dir', 'large_file_threshold',
-        'buffer_size', 'max_file_size'
+        'buffer_size', 'max_file_size', 'seg_model_name', 'seg_num_ctx',
+        'mem_model_name', 'mem_num_ctx', 'fast_path_max_chars', 'fast_path_min_tags',
+        'compaction_workers', 'compaction_batch_size', 'compaction_part_size'
     ]
     
     for field in required_fields:
@@ -80,6 +114,15 @@ def validate_config(config: Config) -> bool:
     if config.large_file_threshold >= config.max_file_size:
         print("Error: large_file_threshold must be smaller than max_file_size")
         return False
+
+    if min(config.compaction_workers, config.compaction_batch_size, config.compaction_part_size) < 1:
+        print("Error: compaction_workers, compaction_batch_size and compaction_part_size must be at least 1")
+        return False
+
+    for field in ('temperature', 'seg_temperature', 'mem_temperature'):
+        if not 0.0 <= getattr(config, field) <= 2.0:
+            print(f"Error: {field} must be between 0.0 and 2.0")
+            return False
         
     return True
 
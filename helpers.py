@@ -9,7 +9,12 @@ from pathlib import Path
 import logging
 from logging_config import get_logger
 
-from utils.text_processing import split_text_with_overlap, process_large_file
+from utils.text_processing import (
+    split_text_with_overlap,
+    process_large_file,
+    extract_keywords,
+    is_self_contained
+)
 from utils.file_io import (
     load_prompt_from_file,
     save_json_to_file,
@@ -4,7 +4,9 @@ import logging
 from logging_config import get_logger
 from helpers import (
     call_ollama, 
-    extract_json_from_llm_output
+    extract_json_from_llm_output,
+    extract_keywords,
+    is_self_contained
 )
 from config import CONFIG
 
@@ -20,6 +22,29 @@ except (FileNotFoundError, IOError, ValueError) as e:
     logger.error(f"Error loading static prompts from JSON file: {e}")
     PROMPTS = {}
 
+def fast_path_memory(core_memory_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Builds a memory object for a short, self-contained core memory using
+    local rules only, skipping the extraction call.
+
+    Returns None when the text is not eligible or yields too few tags, in
+    which case the caller should fall back to the LLM.
+    """
+    if not is_self_contained(core_memory_text, CONFIG.fast_path_max_chars):
+        return None
+
+    # Allow enough keywords for fast_path_min_tags to be reachable
+    tags = extract_keywords(core_memory_text, max_keywords=max(5, CONFIG.fast_path_min_tags))
+    if len(tags) < CONFIG.fast_path_min_tags:
+        return None
+
+    return {
+        "type": "memory_update",
+        "memory": core_memory_text.strip(),
+        "context": "",
+        "tags": tags
+    }
+
 def mnemonic_extraction_agent(full_chunk: str, core_memory_text: str) -> Dict[str, Any]:
     """
     Processes the data with the mnemonic agent to create a memory object
@@ -32,12 +57,21 @@ def mnemonic_extraction_agent(full_chunk: str, core_memory_text: str) -> Dict[st
         "context": "string",
         "tags": [ "keywords", "minimum", "three" ]
       }
+
+    When the fast path is enabled, short self-contained core memories are
+    converted locally without calling the LLM.
     """
 
     if not full_chunk or not core_memory_text:
         logger.error("Invalid data provided for mnemonic extraction (missing chunk or memory text).")
         return {}
 
+    if CONFIG.fast_path_enabled:
+        fast_memory = fast_path_memory(core_memory_text)
+        if fast_memory:
+            logger.info("Core memory handled by rule-based fast path.")
+            return fast_memory
+
     if not PROMPTS:
         logger.error("Static prompts are not available. Ensure 'prompts.json' is correctly configured.")
         return {}
@@ -53,7 +87,10 @@ def mnemonic_extraction_agent(full_chunk: str, core_memory_text: str) -> Dict[st
 
     raw_response = call_ollama(
         user_prompt=user_prompt,
-        system_prompt=system_prompt
+        system_prompt=system_prompt,
+        model=CONFIG.mem_model_name,
+        temperature=CONFIG.mem_temperature,
+        num_ctx=CONFIG.mem_num_ctx
     )
 
     if not raw_response:
@@ -86,3 +123,7 @@ def mnemonic_extraction_agent(full_chunk: str, core_memory_text: str) -> Dict[st
         "context": memory_update.get("context", ""),
         "tags": memory_update.get("tags", [])
     }
+
+logger.info(f"Using extraction model: {CONFIG.mem_model_name}")
+logger.info(f"Extraction temperature: {CONFIG.mem_temperature}")
+logger.info(f"Fast path enabled: {CONFIG.fast_path_enabled}")
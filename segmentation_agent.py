@@ -43,7 +43,10 @@ def segment_input_into_chunks(input_text: str) -> Optional[List[str]]:
     # Call the LLM
     raw_segmentation = call_ollama(
         user_prompt=user_prompt,
-        system_prompt=system_prompt
+        system_prompt=system_prompt,
+        model=CONFIG.seg_model_name,
+        temperature=CONFIG.seg_temperature,
+        num_ctx=CONFIG.seg_num_ctx
     )
 
     logger.debug(f"Raw segmentation output:\n{raw_segmentation}")
@@ -59,5 +62,5 @@ def segment_input_into_chunks(input_text: str) -> Optional[List[str]]:
         return []
     return segmentation_response
 
-logger.info(f"Using model: {CONFIG.model_name}")
-logger.info(f"Temperature: {CONFIG.temperature}")
+logger.info(f"Using segmentation model: {CONFIG.seg_model_name}")
+logger.info(f"Segmentation temperature: {CONFIG.seg_temperature}")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# config.py exits at import time without an API key, so provide a dummy one
+os.environ.setdefault("API_KEY", "test-api-key-0000")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,158 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from utils.compaction import (
+    COMPACTED_DIR_NAME,
+    MANIFEST_NAME,
+    compact_outputs,
+    load_manifest,
+    save_manifest
+)
+
+
+def write_memories(output_dir, count, start=0):
+    for index in range(start, start + count):
+        path = os.path.join(output_dir, f"memory_{index:04d}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"type": "memory_update", "memory": f"m{index}", "context": "", "tags": []}, file)
+
+
+def read_jsonl_parts(output_dir):
+    compacted_dir = os.path.join(output_dir, COMPACTED_DIR_NAME)
+    records = []
+    for part in load_manifest(compacted_dir)["parts"]:
+        with gzip.open(os.path.join(compacted_dir, part), "rt", encoding="utf-8") as file:
+            records.extend(json.loads(line) for line in file)
+    return records
+
+
+def test_compaction_splits_parts_and_runs_incrementally(tmp_path):
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 25)
+    summary = compact_outputs(output_dir, workers=1, batch_size=4, part_size=10, output_format="jsonl")
+    assert summary["compacted"] == 25
+    assert len(summary["parts"]) == 3
+
+    write_memories(output_dir, 5, start=25)
+    summary = compact_outputs(output_dir, workers=1, batch_size=4, part_size=10, output_format="jsonl")
+    assert summary["compacted"] == 5
+
+    records = read_jsonl_parts(output_dir)
+    assert sorted(record["memory"] for record in records) == sorted(f"m{index}" for index in range(30))
+
+
+def test_compaction_removes_originals_and_skips_unreadable_files(tmp_path):
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 3)
+    (tmp_path / "memory_bad.json").write_text("not json")
+    summary = compact_outputs(output_dir, workers=1, remove_originals=True, output_format="jsonl")
+    assert summary["compacted"] == 3
+    assert summary["failed"] == 1
+    assert summary["removed"] == 3
+    assert sorted(os.listdir(output_dir)) == [COMPACTED_DIR_NAME, "memory_bad.json"]
+
+
+def test_compaction_removes_pending_parts(tmp_path):
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 2)
+    compacted_dir = tmp_path / COMPACTED_DIR_NAME
+    compacted_dir.mkdir()
+    (compacted_dir / "memories-pending.jsonl.gz").write_bytes(b"")
+    (compacted_dir / "memories-partial.jsonl.gz.tmp").write_bytes(b"")
+    save_manifest({"parts": [], "pending_parts": ["memories-pending.jsonl.gz"], "compacted_files": []}, str(compacted_dir))
+
+    compact_outputs(output_dir, workers=1, output_format="jsonl")
+    assert not (compacted_dir / "memories-pending.jsonl.gz").exists()
+    assert not (compacted_dir / "memories-partial.jsonl.gz.tmp").exists()
+    assert load_manifest(str(compacted_dir))["pending_parts"] == []
+    assert len(read_jsonl_parts(output_dir)) == 2
+
+
+def test_compaction_keeps_unregistered_parts(tmp_path):
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 2)
+    compact_outputs(output_dir, workers=1, output_format="jsonl")
+    compacted_dir = tmp_path / COMPACTED_DIR_NAME
+    (compacted_dir / "memories-unknown.jsonl.gz").write_bytes(b"")
+
+    compact_outputs(output_dir, workers=1, output_format="jsonl")
+    assert (compacted_dir / "memories-unknown.jsonl.gz").exists()
+
+
+def test_compaction_refuses_to_run_without_manifest(tmp_path):
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 3)
+    compact_outputs(output_dir, workers=1, remove_originals=True, output_format="jsonl")
+    compacted_dir = tmp_path / COMPACTED_DIR_NAME
+    (compacted_dir / MANIFEST_NAME).unlink()
+    parts = sorted(os.listdir(compacted_dir))
+
+    with pytest.raises(ValueError, match="missing"):
+        compact_outputs(output_dir, workers=1, output_format="jsonl")
+    assert sorted(os.listdir(compacted_dir)) == parts
+
+
+@pytest.mark.parametrize("content", ["[]", "{}", '{"parts": [], "compacted_files": {}}', "not json"])
+def test_compaction_rejects_malformed_manifest(tmp_path, content):
+    write_memories(str(tmp_path), 1)
+    compacted_dir = tmp_path / COMPACTED_DIR_NAME
+    compacted_dir.mkdir()
+    (compacted_dir / MANIFEST_NAME).write_text(content)
+    with pytest.raises(ValueError, match="Manifest"):
+        compact_outputs(str(tmp_path), workers=1, output_format="jsonl")
+
+
+@pytest.mark.parametrize("arguments", [{"workers": 0}, {"batch_size": -3}, {"part_size": 0}, {"output_format": "csv"}])
+def test_compaction_rejects_invalid_arguments(tmp_path, arguments):
+    write_memories(str(tmp_path), 1)
+    with pytest.raises(ValueError):
+        compact_outputs(str(tmp_path), **arguments)
+
+
+def test_compaction_rejects_mixed_formats(tmp_path):
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 1)
+    compacted_dir = tmp_path / COMPACTED_DIR_NAME
+    compacted_dir.mkdir()
+    save_manifest({"format": "parquet", "parts": [], "pending_parts": [], "compacted_files": []}, str(compacted_dir))
+    with pytest.raises(ValueError, match="format"):
+        compact_outputs(output_dir, workers=1, output_format="jsonl")
+
+
+def test_compaction_auto_format_follows_existing_dataset(tmp_path):
+    pytest.importorskip("pyarrow")
+    output_dir = str(tmp_path)
+    write_memories(output_dir, 2)
+    compact_outputs(output_dir, workers=1, output_format="jsonl")
+    write_memories(output_dir, 2, start=2)
+    summary = compact_outputs(output_dir, workers=1, output_format="auto")
+    assert summary["parts"][0].endswith(".jsonl.gz")
+    assert len(read_jsonl_parts(output_dir)) == 4
+
+
+def test_compaction_parquet_parts_share_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+    from utils.compaction import PARQUET_SCHEMA
+
+    output_dir = str(tmp_path)
+    # The first run has only empty tag lists, which schema inference would type as list<null>
+    write_memories(output_dir, 2)
+    compact_outputs(output_dir, workers=1, output_format="parquet")
+    path = tmp_path / "memory_9999.json"
+    path.write_text(json.dumps({"memory": "tagged", "tags": ["alpha", "beta"]}))
+    compact_outputs(output_dir, workers=1, output_format="parquet")
+
+    compacted_dir = os.path.join(output_dir, COMPACTED_DIR_NAME)
+    manifest = load_manifest(compacted_dir)
+    assert manifest["format"] == "parquet"
+    table = ds.dataset(
+        [os.path.join(compacted_dir, part) for part in manifest["parts"]],
+        format="parquet"
+    ).to_table()
+    assert table.schema.equals(PARQUET_SCHEMA)
+    assert table.num_rows == 3
+    assert ["alpha", "beta"] in table.column("tags").to_pylist()
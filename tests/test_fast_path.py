@@ -0,0 +1,87 @@
+from config import CONFIG
+from utils.text_processing import extract_keywords, is_self_contained
+from memory_extraction_agent import fast_path_memory, mnemonic_extraction_agent
+
+
+def test_extract_keywords_ranks_by_frequency_then_first_appearance():
+    text = "Berlin trains are late. Trains in Berlin run often; trains are busy."
+    assert extract_keywords(text) == ["trains", "berlin", "late", "run", "busy"]
+
+
+def test_extract_keywords_respects_limits():
+    text = "Quantum computing uses qubits for parallel computation"
+    assert extract_keywords(text, max_keywords=2) == ["quantum", "computing"]
+    assert "uses" not in extract_keywords(text, min_length=5)
+
+
+def test_extract_keywords_drops_stopwords_and_contractions():
+    assert extract_keywords("The user prefers dark mode in every editor.") == [
+        "user", "prefers", "dark", "mode", "editor"
+    ]
+    assert "don't" not in extract_keywords("Don't schedule meetings on Friday mornings.")
+    assert extract_keywords("User's favorite color is teal.")[0] == "user"
+    assert extract_keywords("Alice’s cat is named Miso.")[0] == "alice"
+
+
+def test_is_self_contained_accepts_short_single_sentence():
+    assert is_self_contained("Alice moved to Berlin in 2019 to join a startup.", 160)
+    # Decimal points are not sentence terminators
+    assert is_self_contained("Python 3.11 improved interpreter speed.", 160)
+
+
+def test_is_self_contained_rejects_long_or_empty_text():
+    text = "Alice moved to Berlin in 2019."
+    assert not is_self_contained(text, len(text) - 1)
+    assert is_self_contained(text, len(text))
+    assert not is_self_contained("   ", 160)
+
+
+def test_is_self_contained_rejects_multiple_sentences():
+    assert not is_self_contained("Alice moved to Berlin. Bob stayed in Rome.", 160)
+
+
+def test_is_self_contained_rejects_referential_words_anywhere():
+    assert not is_self_contained("Then they left for Paris with their kids", 160)
+    assert not is_self_contained("The user said he likes tea", 160)
+    assert not is_self_contained("Alice likes tea; she drinks it daily", 160)
+
+
+def test_fast_path_memory_builds_memory_object():
+    memory = fast_path_memory("  Alice moved to Berlin in 2019 to join a robotics startup. ")
+    assert memory == {
+        "type": "memory_update",
+        "memory": "Alice moved to Berlin in 2019 to join a robotics startup.",
+        "context": "",
+        "tags": ["alice", "moved", "berlin", "2019", "join"]
+    }
+
+
+def test_fast_path_memory_falls_back_with_too_few_tags(monkeypatch):
+    monkeypatch.setattr(CONFIG, "fast_path_min_tags", 3)
+    assert fast_path_memory("Alice likes tea.")["tags"] == ["alice", "likes", "tea"]
+    assert fast_path_memory("Alice sings.") is None
+    monkeypatch.setattr(CONFIG, "fast_path_min_tags", 4)
+    assert fast_path_memory("Alice likes tea.") is None
+
+
+def test_fast_path_memory_allows_min_tags_above_default_limit(monkeypatch):
+    monkeypatch.setattr(CONFIG, "fast_path_min_tags", 7)
+    memory = fast_path_memory("Alice moved to Berlin in 2019 to join a robotics startup downtown.")
+    assert memory["tags"] == ["alice", "moved", "berlin", "2019", "join", "robotics", "startup"]
+
+
+def test_fast_path_memory_rejects_dependent_segments():
+    assert fast_path_memory("The user said he likes green tea and oolong.") is None
+
+
+def test_mnemonic_extraction_agent_uses_fast_path_when_enabled(monkeypatch):
+    def fail_call(*args, **kwargs):
+        raise AssertionError("extraction call should be skipped")
+
+    monkeypatch.setattr(CONFIG, "fast_path_enabled", True)
+    monkeypatch.setattr("memory_extraction_agent.call_ollama", fail_call)
+    memory = mnemonic_extraction_agent(
+        full_chunk="Some chunk.",
+        core_memory_text="Alice moved to Berlin to join a robotics startup."
+    )
+    assert memory["tags"] == ["alice", "moved", "berlin", "join", "robotics"]
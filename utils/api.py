@@ -14,6 +14,7 @@ def call_ollama(
     system_prompt: str = "",
     model: str = CONFIG.model_name,
     temperature: float = CONFIG.temperature,
+    num_ctx: int = CONFIG.generation_window,
     max_retries: int = 3,
     retry_delay: int = 1
 ) -> str:
@@ -26,6 +27,7 @@ def call_ollama(
         system_prompt (str, optional): System context prompt
         model (str, optional): Model to use
         temperature (float, optional): Sampling temperature
+        num_ctx (int, optional): Context window size passed to the model
         max_retries (int, optional): Maximum number of retry attempts
         retry_delay (int, optional): Delay between retries in seconds
     
@@ -40,7 +42,7 @@ def call_ollama(
         ],
         "temperature": temperature,
         "options": {
-            "num_ctx": CONFIG.generation_window,
+            "num_ctx": num_ctx,
         },
         "stream": False,
         "raw": False
@@ -0,0 +1,379 @@
+"""
+Compaction utilities for folding individual memory JSON files into columnar part files.
+"""
+
+import os
+import json
+import gzip
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from logging_config import get_logger
+from config import CONFIG
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Fixed schema so part files from separate runs can be read as one dataset
+PARQUET_SCHEMA = pa.schema([
+    ("source_file", pa.string()),
+    ("type", pa.string()),
+    ("memory", pa.string()),
+    ("context", pa.string()),
+    ("tags", pa.list_(pa.string()))
+]) if pa is not None else None
+
+logger = get_logger(__name__)
+
+COMPACTED_DIR_NAME = "compacted"
+MANIFEST_NAME = "manifest.json"
+MEMORY_FILE_PREFIX = "memory_"
+MEMORY_FILE_SUFFIX = ".json"
+PART_FILE_PREFIX = "memories-"
+COLUMNS = ["source_file", "type", "memory", "context", "tags"]
+PART_FILE_SUFFIXES = {"parquet": ".parquet", "jsonl": ".jsonl.gz"}
+
+def find_memory_files(output_dir: str) -> List[str]:
+    """
+    Lists memory JSON files written by save_memory_to_file in the output directory.
+
+    Args:
+        output_dir (str): Directory containing memory_*.json files
+
+    Returns:
+        list: Sorted full paths of memory files
+    """
+    paths = []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if (
+                name.startswith(MEMORY_FILE_PREFIX)
+                and name.endswith(MEMORY_FILE_SUFFIX)
+                and entry.is_file()
+            ):
+                paths.append(entry.path)
+    paths.sort()
+    return paths
+
+def read_memory_batch(paths: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Reads a batch of memory files into flat records. Runs inside worker processes.
+
+    Args:
+        paths (list): Paths of memory JSON files to read
+
+    Returns:
+        tuple: (records, failed_paths) where failed files are left untouched
+    """
+    records = []
+    failed = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                memory_object = json.load(file)
+        except (IOError, ValueError):
+            failed.append(path)
+            continue
+
+        if not isinstance(memory_object, dict):
+            failed.append(path)
+            continue
+
+        tags = memory_object.get("tags", [])
+        records.append({
+            "source_file": os.path.basename(path),
+            "type": str(memory_object.get("type", "memory_update")),
+            "memory": str(memory_object.get("memory", "")),
+            "context": str(memory_object.get("context", "")),
+            "tags": [str(tag) for tag in tags] if isinstance(tags, list) else []
+        })
+    return records, failed
+
+def load_manifest(compacted_dir: str) -> Dict[str, Any]:
+    """
+    Loads the compaction manifest, returning an empty one if none exists yet.
+
+    Args:
+        compacted_dir (str): Directory holding the part files and manifest
+
+    Returns:
+        dict: Manifest with the dataset 'format' (None until the first part is
+            written) and 'parts', 'pending_parts' and 'compacted_files' lists
+
+    Raises:
+        ValueError: If the manifest is missing but part files already exist,
+            or if it is not valid JSON with the expected structure
+    """
+    manifest_path = os.path.join(compacted_dir, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        # Without the manifest there is no way to tell which parts are complete
+        existing_parts = [name for name in os.listdir(compacted_dir) if name.startswith(PART_FILE_PREFIX)]
+        if existing_parts:
+            raise ValueError(
+                f"Manifest {manifest_path} is missing but {len(existing_parts)} part files exist. "
+                "Restore the manifest or move the part files elsewhere before compacting."
+            )
+        return {"format": None, "parts": [], "pending_parts": [], "compacted_files": []}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except ValueError as e:
+        raise ValueError(f"Manifest {manifest_path} is not valid JSON: {e}")
+
+    if not isinstance(manifest, dict):
+        raise ValueError(f"Manifest {manifest_path} must contain a JSON object")
+    manifest.setdefault("pending_parts", [])
+    for key in ("parts", "pending_parts", "compacted_files"):
+        value = manifest.get(key)
+        if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+            raise ValueError(f"Manifest {manifest_path} must contain a '{key}' list of file names")
+
+    if "format" not in manifest:
+        # Manifests written before the format was recorded
+        formats = {
+            output_format for part in manifest["parts"]
+            for output_format, suffix in PART_FILE_SUFFIXES.items() if part.endswith(suffix)
+        }
+        if len(formats) > 1:
+            raise ValueError(f"Manifest {manifest_path} lists parts in more than one format")
+        manifest["format"] = formats.pop() if formats else None
+    if manifest["format"] not in (None, *PART_FILE_SUFFIXES):
+        raise ValueError(f"Manifest {manifest_path} has an unknown format: {manifest['format']}")
+    return manifest
+
+def save_manifest(manifest: Dict[str, Any], compacted_dir: str) -> None:
+    """
+    Atomically writes the compaction manifest.
+
+    Args:
+        manifest (dict): Manifest to persist
+        compacted_dir (str): Directory holding the part files and manifest
+    """
+    manifest_path = os.path.join(compacted_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+def remove_incomplete_parts(manifest: Dict[str, Any], compacted_dir: str) -> List[str]:
+    """
+    Deletes temporary files and parts still marked as pending in the manifest.
+    These are left behind when a run stops between starting a part and
+    registering it; their source files are compacted again by the next run.
+    Part files the manifest does not know about are never deleted.
+
+    Args:
+        manifest (dict): Current compaction manifest, updated in place
+        compacted_dir (str): Directory holding the part files and manifest
+
+    Returns:
+        list: File names of the removed files
+    """
+    pending = set(manifest["pending_parts"])
+    registered = set(manifest["parts"])
+    removed = []
+    with os.scandir(compacted_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp") or entry.name in pending:
+                try:
+                    os.remove(entry.path)
+                    removed.append(entry.name)
+                except OSError as e:
+                    logger.error(f"Error removing incomplete part file {entry.name}: {e}")
+            elif entry.name.startswith(PART_FILE_PREFIX) and entry.name not in registered:
+                logger.warning(f"Leaving unregistered part file in place: {entry.name}")
+    for name in removed:
+        logger.warning(f"Removed incomplete part file: {name}")
+    manifest["pending_parts"] = []
+    return removed
+
+def resolve_output_format(output_format: str) -> str:
+    """
+    Resolves 'auto' to a concrete part file format and checks that it is usable.
+
+    Args:
+        output_format (str): 'parquet', 'jsonl' or 'auto'
+
+    Returns:
+        str: 'parquet' or 'jsonl'
+
+    Raises:
+        ValueError: If the format is unknown or parquet is requested without pyarrow
+    """
+    if output_format == "auto":
+        return "parquet" if pq is not None else "jsonl"
+    if output_format not in PART_FILE_SUFFIXES:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if output_format == "parquet" and pq is None:
+        raise ValueError("Parquet output requires pyarrow. Install it or use the jsonl format.")
+    return output_format
+
+def new_part_name(output_format: str) -> str:
+    """
+    Builds a unique part file name for the given resolved output format.
+
+    Args:
+        output_format (str): 'parquet' or 'jsonl'
+
+    Returns:
+        str: Part file name, relative to the compacted directory
+    """
+    stem = f"{PART_FILE_PREFIX}{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    return f"{stem}{PART_FILE_SUFFIXES[output_format]}"
+
+def write_part_file(records: List[Dict[str, Any]], part_path: str, output_format: str) -> None:
+    """
+    Writes records to a part file as Parquet or as gzip-compressed JSONL.
+    The file is written to a temporary path and moved into place when complete.
+
+    Args:
+        records (list): Flat memory records to write
+        part_path (str): Final path of the part file
+        output_format (str): 'parquet' or 'jsonl', as returned by resolve_output_format
+    """
+    tmp_path = part_path + ".tmp"
+
+    if output_format == "parquet":
+        table = pa.table(
+            {column: [record[column] for record in records] for column in COLUMNS},
+            schema=PARQUET_SCHEMA
+        )
+        pq.write_table(table, tmp_path, compression="zstd")
+    else:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False))
+                file.write("\n")
+
+    os.replace(tmp_path, part_path)
+
+def _batched(paths: List[str], batch_size: int) -> Iterator[List[str]]:
+    for start in range(0, len(paths), batch_size):
+        yield paths[start:start + batch_size]
+
+def compact_outputs(
+    output_dir: Optional[str] = None,
+    remove_originals: bool = False,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    part_size: Optional[int] = None,
+    output_format: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Folds memory_*.json files in the output directory into columnar part files
+    of at most part_size records each, saving the manifest after every part so
+    memory use stays bounded. Files already listed in the manifest are skipped,
+    so repeated runs only pick up new memories.
+
+    The manifest's 'parts' list is the source of truth for readers. Each part is
+    recorded as pending before it is written, so parts left pending by an
+    interrupted run are removed at startup. Originals are only removed once
+    they are recorded in the manifest, including those compacted by earlier runs.
+
+    Args:
+        output_dir (str, optional): Directory with memory files. Defaults to CONFIG.output_dir
+        remove_originals (bool): Delete source files once their part file and manifest are written
+        workers (int, optional): Number of reader processes. Defaults to CONFIG.compaction_workers
+        batch_size (int, optional): Files read per task. Defaults to CONFIG.compaction_batch_size
+        part_size (int, optional): Files folded into each part. Defaults to CONFIG.compaction_part_size
+        output_format (str): 'parquet', 'jsonl' or 'auto' (default: 'auto'). 'auto'
+            follows the format of an existing dataset
+
+    Returns:
+        dict: Summary with the written part names and compacted, failed and removed counts
+
+    Raises:
+        ValueError: If workers, batch_size or part_size is below 1, the output format is
+            unusable, or the manifest is missing while part files exist
+    """
+    output_dir = output_dir or CONFIG.output_dir
+    workers = CONFIG.compaction_workers if workers is None else workers
+    batch_size = CONFIG.compaction_batch_size if batch_size is None else batch_size
+    part_size = CONFIG.compaction_part_size if part_size is None else part_size
+    if workers < 1 or batch_size < 1 or part_size < 1:
+        raise ValueError("workers, batch_size and part_size must be at least 1")
+    # Fail before the expensive scan rather than after every file has been read
+    requested_format = output_format
+    output_format = resolve_output_format(output_format)
+    compacted_dir = os.path.join(output_dir, COMPACTED_DIR_NAME)
+    os.makedirs(compacted_dir, exist_ok=True)
+
+    manifest = load_manifest(compacted_dir)
+    # All parts of a dataset share one format so readers can load them together
+    if manifest["format"] is not None and manifest["format"] != output_format:
+        if requested_format != "auto":
+            raise ValueError(
+                f"Existing compacted dataset uses the {manifest['format']} format, "
+                f"cannot add {output_format} parts to it"
+            )
+        output_format = resolve_output_format(manifest["format"])
+    if remove_incomplete_parts(manifest, compacted_dir):
+        save_manifest(manifest, compacted_dir)
+    already_compacted = set(manifest["compacted_files"])
+    all_paths = find_memory_files(output_dir)
+    paths = [path for path in all_paths if os.path.basename(path) not in already_compacted]
+    summary = {"parts": [], "compacted": 0, "failed": 0, "removed": 0}
+
+    # Originals left behind by earlier runs that did not remove them
+    removable_names = [
+        os.path.basename(path) for path in all_paths
+        if os.path.basename(path) in already_compacted
+    ]
+
+    if paths:
+        logger.info(f"Compacting {len(paths)} memory files with {workers} workers...")
+        files_read = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Each window of paths becomes one part, so only one part's records are held at a time
+            for window in _batched(paths, part_size):
+                records = []
+                for batch_records, batch_failed in executor.map(read_memory_batch, _batched(window, batch_size)):
+                    records.extend(batch_records)
+                    for path in batch_failed:
+                        logger.error(f"Skipping unreadable memory file: {path}")
+                    summary["failed"] += len(batch_failed)
+                    files_read += len(batch_records) + len(batch_failed)
+                    logger.info(f"Compaction progress: {files_read}/{len(paths)} files read")
+
+                if not records:
+                    continue
+
+                part_name = new_part_name(output_format)
+                manifest["format"] = output_format
+                manifest["pending_parts"].append(part_name)
+                save_manifest(manifest, compacted_dir)
+                write_part_file(records, os.path.join(compacted_dir, part_name), output_format)
+
+                compacted_names = [record["source_file"] for record in records]
+                manifest["pending_parts"].remove(part_name)
+                manifest["parts"].append(part_name)
+                manifest["compacted_files"].extend(compacted_names)
+                save_manifest(manifest, compacted_dir)
+                removable_names.extend(compacted_names)
+                summary["parts"].append(part_name)
+                summary["compacted"] += len(records)
+                logger.info(f"Compacted {len(records)} memories into {os.path.join(compacted_dir, part_name)}")
+
+        if not summary["parts"]:
+            logger.info("No valid memory files to compact.")
+    else:
+        logger.info("No new memory files to compact.")
+
+    if remove_originals:
+        for name in removable_names:
+            try:
+                os.remove(os.path.join(output_dir, name))
+                summary["removed"] += 1
+            except OSError as e:
+                logger.error(f"Error removing compacted memory file {name}: {e}")
+        logger.info(f"Removed {summary['removed']} original memory files.")
+
+    return summary
@@ -2,6 +2,7 @@
 Text processing utilities for chunking and handling large text inputs.
 """
 
+import re
 from typing import List
 import logging
 from logging_config import get_logger
@@ -9,6 +10,32 @@ from config import CONFIG
 
 logger = get_logger(__name__)
 
+# Common English function words and fillers that carry no value as memory tags
+STOPWORDS = frozenset("""
+a about above across after again against ago all almost along already also
+although always am among an and another any anyone anything are around as at
+away back be because been before being below between both but by can cannot
+could did do does doing done down during each either else enough etc even ever
+every everyone everything few for from further get gets got had has have having
+he her here hers herself him himself his how however i if in instead into is it
+its itself just least less lot lots many may me might more most much must my
+myself neither never no nobody none nor not nothing now of off often on once one
+only onto or other others otherwise our ours ourselves out over own per perhaps
+quite rather really same several shall she should since so some someone
+something sometimes still such than that the their theirs them themselves then
+there therefore these they thing things this those though through thus to too
+toward towards under unless until up upon us very via was we well were what
+whatever when whenever where wherever whether which while who whoever whom whose
+why will with within without would yet you your yours yourself yourselves
+""".split())
+
+# Pronouns and demonstratives that indicate a segment depends on outside context
+REFERENTIAL_WORDS = frozenset("""
+he him his she her hers it its they them their theirs this that these those
+""".split())
+
+WORD_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9'\u2019\-]*")
+
 def split_text_with_overlap(text: str, chunk_size: int = 2000, overlap: int = 200) -> List[str]:
     """
     Splits input text into overlapping chunks of specified size.
@@ -93,3 +120,58 @@ def process_large_file(file_path: str, buffer_size: int = 1024*1024) -> List[str
     except IOError as e:
         logger.error(f"Error processing large file: {e}")
         return chunks
+
+def extract_keywords(text: str, max_keywords: int = 5, min_length: int = 3) -> List[str]:
+    """
+    Derives keyword tags from text without an LLM call.
+    Words are lowercased, possessive 's is removed, stopwords and other
+    words containing apostrophes are dropped and the remaining terms are
+    ranked by frequency, with ties broken by first appearance.
+    
+    Args:
+        text (str): The text to derive keywords from
+        max_keywords (int): Maximum number of keywords to return (default: 5)
+        min_length (int): Minimum length of a keyword in characters (default: 3)
+    
+    Returns:
+        list: A list of unique lowercase keywords
+    """
+    counts = {}
+    for word in WORD_PATTERN.findall(text):
+        word = word.lower().replace("\u2019", "'").strip("'-")
+        if word.endswith("'s"):
+            word = word[:-2]
+        if "'" in word or len(word) < min_length or word in STOPWORDS:
+            continue
+        counts[word] = counts.get(word, 0) + 1
+
+    # dicts preserve insertion order, so sorted() keeps first appearance on ties
+    ranked = sorted(counts, key=lambda word: counts[word], reverse=True)
+    return ranked[:max_keywords]
+
+def is_self_contained(text: str, max_chars: int) -> bool:
+    """
+    Heuristically checks whether a segment can stand on its own as a memory.
+    The text must be short, a single sentence and must not contain a
+    pronoun or demonstrative that refers back to the surrounding chunk.
+    
+    Args:
+        text (str): The segment text to check
+        max_chars (int): Maximum length in characters for a self-contained segment
+    
+    Returns:
+        bool: True if the segment can be turned into a memory without extraction
+    """
+    text = text.strip()
+    if not text or len(text) > max_chars:
+        return False
+
+    # More than one sentence terminator usually means the segment is a summary
+    if len(re.findall(r"[.!?](?:\s|$)", text)) > 1:
+        return False
+
+    words = [word.lower() for word in WORD_PATTERN.findall(text)]
+    if not words or any(word in REFERENTIAL_WORDS for word in words):
+        return False
+
+    return True